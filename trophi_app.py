@@ -7,7 +7,10 @@ import json
 import hashlib
 import re
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, List, Dict
 from pydantic import BaseModel, Field, validator
 from tenacity import retry, stop_after_attempt, wait_fixed
 import logging
@@ -50,14 +53,80 @@ class Settings:
         self.sprint_hours = 320
         self.ltv = 205
         self.cac = 52
+        self.gemini_model = SECRETS.get("GEMINI_MODEL", "gemini-1.5-flash-001")
         self.gemini_requests_per_minute = 15
         self.steamspy_delay_seconds = 1.1
         self.db_path = SECRETS.get("DB_PATH", "/tmp/trophi_analyses.db")
         self.log_path = SECRETS.get("LOG_PATH", "logs/app.log")
         self.export_path = SECRETS.get("EXPORT_PATH", "exports")
+        self.analysis_reuse_hours = int(SECRETS.get("ANALYSIS_REUSE_HOURS", 24))
 
 settings = Settings()
 
+# ============================================================================
+# 🔧 PARSING HELPERS
+# ============================================================================
+_INT_RE = re.compile(r'([\d,]+)')
+
+def parse_user_count(active_users: str) -> int:
+    match = _INT_RE.search(active_users)
+    return int(match.group(1).replace(',', '')) if match else 0
+
+def normalize_target(target: str) -> str:
+    return " ".join(target.split())
+
+_FENCE_RE = re.compile(r'```(?:json)?', re.IGNORECASE)
+
+def extract_json_object(text: str) -> Optional[str]:
+    # Single left-to-right scan for the first balanced {...}, ignoring braces in strings
+    depth, start, in_string, escaped = 0, -1, False, False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = depth > 0
+        elif char == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _loads_object(text: str) -> Optional[Dict]:
+    # Only JSON objects are usable; lists, numbers and strings count as failures
+    try:
+        result = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return result if isinstance(result, dict) else None
+
+def parse_json_response(raw: str) -> Optional[Dict]:
+    stripped = raw.strip()
+    if stripped.startswith('{') and stripped.endswith('}'):
+        result = _loads_object(stripped)
+        if result is not None:
+            return result
+    
+    cleaned = _FENCE_RE.sub('', stripped).strip()
+    result = _loads_object(cleaned)
+    if result is not None:
+        return result
+    candidate = extract_json_object(cleaned)
+    if candidate:
+        result = _loads_object(candidate)
+        if result is not None:
+            return result
+    logger.warning("AI response is not valid JSON", preview=raw[:80])
+    return None
+
 # ============================================================================
 # 📊 DATA MODELS
 # ============================================================================
@@ -71,6 +140,10 @@ class MarketData(BaseModel):
     confidence: int = Field(..., ge=0, le=100)
     rationale: str = Field(..., min_length=10)
     is_estimated: bool = Field(default=False)
+    
+    @cached_property
+    def user_count(self) -> int:
+        return parse_user_count(self.active_users)
 
 class TechnicalSpec(BaseModel):
     method: str = Field(..., pattern=r'^(API|UDP|Hybrid)$')
@@ -99,6 +172,13 @@ class StrategicAnalysis(BaseModel):
     speedrun_leverage: str = Field(..., min_length=5)
     risk_level: str = Field(..., pattern=r'^(Low|Medium|High)$')
 
+class DevImpact(BaseModel):
+    hours_required: int
+    sprint_capacity_pct: float
+    cost_at_120_hr: str
+    parallelizable: bool
+    runway_impact: str
+
 class OpportunityResult(BaseModel):
     target: str
     overall_score: float
@@ -108,7 +188,7 @@ class OpportunityResult(BaseModel):
     technical: TechnicalSpec
     financial: Dict[str, FinancialModel]
     strategic: StrategicAnalysis
-    dev_impact: Dict[str, Any]
+    dev_impact: DevImpact
     analysis_date: str
     data_sources: List[str]
 
@@ -123,10 +203,9 @@ class SteamSpyClient:
     async def search_game(self, session: aiohttp.ClientSession, game_name: str) -> Optional[Dict]:
         try:
             await asyncio.sleep(self.rate_limit_delay)
-            headers = {"User-Agent": "Trophi.ai Engine/1.0"}
             search_url = f"{self.base_url}?request=search&query={game_name}"
             
-            async with session.get(search_url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            async with session.get(search_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     if "application/json" not in response.headers.get("content-type", ""):
                         logger.warning("SteamSpy returned HTML", status=response.status)
@@ -146,10 +225,9 @@ class SteamSpyClient:
     async def get_app_details(self, session: aiohttp.ClientSession, app_id: str) -> Optional[Dict]:
         try:
             await asyncio.sleep(self.rate_limit_delay)
-            headers = {"User-Agent": "Trophi.ai Engine/1.0"}
             detail_url = f"{self.base_url}?request=appdetails&appid={app_id}"
             
-            async with session.get(detail_url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            async with session.get(detail_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200 and "application/json" in response.headers.get("content-type", ""):
                     data = await response.json()
                     if data.get("average_2weeks"):
@@ -170,28 +248,69 @@ steamspy_client = SteamSpyClient()
 # ============================================================================
 from google import genai
 
+GEMINI_MODEL = settings.gemini_model
+_MARKET_PROMPT = 'Return ONLY JSON: {{"tam": "$25M", "sam": "$12M", "som": "$1.2M", "active_users": "15,000", "cagr": "7.3%", "source": "AI-estimated", "confidence": 35, "rationale": "Fallback for {target}"}}'.format
+# Fills fields a partial Gemini answer leaves out; mirrors the prompt's example
+AI_MARKET_DEFAULTS = MappingProxyType({
+    "tam": "$25M", "sam": "$12M", "som": "$1.2M",
+    "active_users": "15,000", "cagr": "7.3%",
+    "source": "AI-estimated", "confidence": 35,
+    "rationale": "AI-estimated market sizing", "is_estimated": True
+})
+
+@st.cache_resource
+def get_genai_client() -> genai.Client:
+    return genai.Client(api_key=settings.gemini_api_key)
+
 class AIEngine:
     def __init__(self):
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        # Only the client is shared across sessions; asyncio primitives stay per run
+        self.client = get_genai_client()
         self.semaphore = asyncio.Semaphore(settings.gemini_requests_per_minute)
     
     @retry(stop=stop_after_attempt(2), wait=wait_fixed(5))
-    async def generate_market_data(self, target: str) -> Optional[str]:
+    async def generate_market_data(self, target: str, refresh: bool = False) -> Optional[Dict]:
         try:
-            prompt = f'Return ONLY JSON: {{"tam": "$25M", "sam": "$12M", "som": "$1.2M", "active_users": "15,000", "cagr": "7.3%", "source": "AI-estimated", "confidence": 35, "rationale": "Fallback for {target}"}}'
-            
+            args = (_MARKET_PROMPT(target=target), GEMINI_MODEL, datetime.now().strftime("%Y-%m-%d"))
+            if refresh:
+                # Drop only this entry so the fresh answer is written back in its place
+                generate_content_cached.clear(*args)
             async with self.semaphore:
-                response = await asyncio.to_thread(
-                    self.client.models.generate_content,
-                    model="gemini-1.5-flash-001",
-                    contents=prompt,
-                    config={"max_output_tokens": 400, "temperature": 0.2}
-                )
-                return response.text
+                return await asyncio.to_thread(generate_content_cached, *args)
         except Exception as e:
             logger.error("Gemini API failed", error=str(e))
             return None
 
+def generate_content(prompt: str, model: str) -> Dict:
+    # Anything but valid MarketData fields raises, so bad output is never cached
+    response_text = ""
+    for chunk in get_genai_client().models.generate_content_stream(
+        model=model,
+        contents=prompt,
+        config={
+            "response_mime_type": "application/json",
+            "max_output_tokens": 180,
+            "temperature": 0.2,
+        }
+    ):
+        text = chunk.text or ""
+        response_text += text
+        if "}" in text and extract_json_object(response_text):
+            break  # JSON object closed, don't wait for trailing tokens
+    data = parse_json_response(response_text) if response_text else None
+    if data is None:
+        raise ValueError("Gemini returned no usable JSON object")
+    missing = AI_MARKET_DEFAULTS.keys() - data.keys()
+    if missing:
+        logger.warning("Gemini response missing fields", fields=sorted(missing))
+    return MarketData(**(AI_MARKET_DEFAULTS | data | {"is_estimated": True})).model_dump()
+
+# Persisted to disk so responses survive restarts. Persisted caches ignore TTL,
+# so cache_day is part of the key instead: an entry is only reused on the day it was made
+@st.cache_data(persist="disk", max_entries=256, show_spinner=False)
+def generate_content_cached(prompt: str, model: str, cache_day: str) -> Dict:
+    return generate_content(prompt, model)
+
 ai_engine = AIEngine()
 
 # ============================================================================
@@ -221,6 +340,8 @@ class Database:
                 )
             """)
             await db.execute("CREATE INDEX IF NOT EXISTS idx_target ON analyses(target)")
+            # Matches get_recent_analysis, which compares targets with NOCASE
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_target_nocase ON analyses(target COLLATE NOCASE, created_at)")
             await db.commit()
             logger.info("Database initialized", path=self.db_path)
     
@@ -245,6 +366,23 @@ class Database:
     
         return analysis_id
     
+    async def get_recent_analysis(self, target: str) -> Optional[OpportunityResult]:
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(
+                """SELECT raw_data FROM analyses
+                WHERE target = ? COLLATE NOCASE AND created_at >= datetime('now', ?)
+                ORDER BY created_at DESC LIMIT 1""",
+                (target, f"-{settings.analysis_reuse_hours} hours")
+            ) as cursor:
+                row = await cursor.fetchone()
+        if not row:
+            return None
+        try:
+            return OpportunityResult.model_validate_json(row[0])
+        except Exception as e:
+            logger.warning("Saved analysis unreadable", error=str(e), target=target)
+            return None
+    
     async def get_history(self, limit: int = 10) -> List[dict]:
         async with aiosqlite.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
@@ -255,13 +393,30 @@ class Database:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
 
-db = Database()
+@st.cache_resource
+def get_database() -> Database:
+    database = Database()
+    asyncio.run(database.init_db())
+    return database
+
+db = get_database()
 
 # ============================================================================
 # 🔄 ANALYSIS PIPELINE
 # ============================================================================
+# Market, technical, revenue, strategy; each component is clamped to 0-10
+_SCORE_WEIGHTS = (3.5, 2.5, 2.5, 1.5)
+_RISK_MULTIPLIERS = MappingProxyType({"Low": 1.0, "Medium": 0.75, "High": 0.45})
+
+FALLBACK_MARKET = MappingProxyType({
+    "tam": "$25M", "sam": "$12M", "som": "$1.2M",
+    "active_users": "15,000", "cagr": "7.3%",
+    "source": "Default fallback", "confidence": 10,
+    "rationale": "All data sources failed", "is_estimated": True
+})
+
 class AnalysisPipeline:
-    async def process_market_phase(self, session, target: str) -> MarketData:
+    async def process_market_phase(self, session, target: str, refresh: bool = False) -> MarketData:
         st.toast("📡 Querying SteamSpy...", icon="🔍")
         
         steamspy_data = await steamspy_client.search_game(session, target)
@@ -279,18 +434,12 @@ class AnalysisPipeline:
                 logger.warning("SteamSpy validation failed", error=str(e))
         
         st.toast("⚠️ Using AI estimation", icon="⚠️")
-        response = await ai_engine.generate_market_data(target)
-        if response:
-            data = json.loads(re.sub(r'```json|```', '', response))
-            return MarketData(**data, is_estimated=True)
+        data = await ai_engine.generate_market_data(target, refresh)
+        if data:
+            return MarketData(**data)
         
         st.toast("⚠️ All APIs failed, using defaults", icon="⚠️")
-        return MarketData(
-            tam="$25M", sam="$12M", som="$1.2M",
-            active_users="15,000", cagr="7.3%",
-            source="Default fallback", confidence=10,
-            rationale="All data sources failed", is_estimated=True
-        )
+        return MarketData(**FALLBACK_MARKET)
     
     async def process_technical_phase(self, target: str) -> TechnicalSpec:
         st.toast("⚙️ Analyzing integration...", icon="⚙️")
@@ -315,7 +464,7 @@ class AnalysisPipeline:
     async def process_financial_phase(self, market: MarketData) -> Dict[str, FinancialModel]:
         st.toast("💰 Modeling revenue...", icon="💰")
         
-        users = int(re.sub(r'[^\d]', '', market.active_users))
+        users = market.user_count
         base_conversion = min(1.5, users / 10000)
         
         return {
@@ -352,38 +501,35 @@ class AnalysisPipeline:
     def calculate_scores(self, market: MarketData, tech: TechnicalSpec, 
                          financial: Dict[str, FinancialModel], 
                          strategic: StrategicAnalysis) -> Dict[str, float]:
-        users = int(re.sub(r'[^\d]', '', market.active_users))
-        market_score = min(10, users / 10000) * 3.5
-        tech_score = (10 - min(tech.hours / 48, 10)) * 2.5
-        revenue_score = financial["base"].conversion * 10 / 1.5 * 2.5
-        strategy_score = strategic.fit_score * 1.5
-        
-        raw_score = market_score + tech_score + revenue_score + strategy_score
-        risk_multiplier = {"Low": 1.0, "Medium": 0.75, "High": 0.45}[tech.risk_level]
+        users = market.user_count
+        components = (
+            users / 10000,
+            10 - tech.hours / 48,
+            financial["base"].conversion * 10 / 1.5,
+            strategic.fit_score,
+        )
+        raw_score = sum(min(max(value, 0), 10) * weight
+                        for value, weight in zip(components, _SCORE_WEIGHTS))
+        risk_multiplier = _RISK_MULTIPLIERS[tech.risk_level]
         
         return {
             "raw": round(raw_score, 1),
             "risk_adjusted": round(raw_score * risk_multiplier, 1)
         }
     
-    async def run_full_pipeline(self, target: str, progress_bar) -> OpportunityResult:
-        async with aiohttp.ClientSession() as session:
-            progress_bar.progress(10, "Phase 1: Market Intelligence...")
-            market_task = self.process_market_phase(session, target)
-            
-            progress_bar.progress(20, "Phase 2: Technical Architecture...")
-            tech_task = self.process_technical_phase(target)
-            
-            market, tech = await asyncio.gather(market_task, tech_task)
-            progress_bar.progress(40)
-            
-            progress_bar.progress(50, "Phase 3: Financial Model...")
-            financial_task = self.process_financial_phase(market)
-            
-            progress_bar.progress(70, "Phase 4: Strategic Fit...")
-            strategic_task = self.process_strategic_phase(target)
+    async def run_full_pipeline(self, target: str, progress_bar, refresh: bool = False) -> OpportunityResult:
+        # Session-level headers apply to every SteamSpy call in this run
+        async with aiohttp.ClientSession(headers={"User-Agent": "Trophi.ai Engine/1.0"}) as session:
+            # Only the financial model depends on another phase (market users)
+            progress_bar.progress(10, "Phases 1, 2 & 4: Market, Technical, Strategic...")
+            market, tech, strategic = await asyncio.gather(
+                self.process_market_phase(session, target, refresh),
+                self.process_technical_phase(target),
+                self.process_strategic_phase(target),
+            )
             
-            financial, strategic = await asyncio.gather(financial_task, strategic_task)
+            progress_bar.progress(70, "Phase 3: Financial Model...")
+            financial = await self.process_financial_phase(market)
             progress_bar.progress(90)
             
             scores = self.calculate_scores(market, tech, financial, strategic)
@@ -395,13 +541,13 @@ class AnalysisPipeline:
                 confidence=market.confidence,
                 market=market, technical=tech,
                 financial=financial, strategic=strategic,
-                dev_impact={
-                    "hours_required": tech.hours,
-                    "sprint_capacity_pct": tech.team_pct_of_sprint,
-                    "cost_at_120_hr": tech.cost_at_120_hr,
-                    "parallelizable": tech.parallelizable,
-                    "runway_impact": f"${tech.hours * settings.engineer_hourly_rate / settings.burn_rate_monthly:.1%}"
-                },
+                dev_impact=DevImpact(
+                    hours_required=tech.hours,
+                    sprint_capacity_pct=tech.team_pct_of_sprint,
+                    cost_at_120_hr=tech.cost_at_120_hr,
+                    parallelizable=tech.parallelizable,
+                    runway_impact=f"${tech.hours * settings.engineer_hourly_rate / settings.burn_rate_monthly:.1%}"
+                ),
                 analysis_date=datetime.now().isoformat(),
                 data_sources=[market.source, "Technical benchmarks", "Trophi metrics"]
             )
@@ -417,95 +563,122 @@ pipeline = AnalysisPipeline()
 # ============================================================================
 # 🎨 UI COMPONENTS
 # ============================================================================
+@st.cache_resource
+def load_css() -> str:
+    return f"<style>{(Path(__file__).parent / 'styles.css').read_text()}</style>"
+
 def render_header():
-    st.markdown("""
-        <style>
-        .investor-header { background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%);
-            border-radius: 20px; padding: 30px; margin-bottom: 20px; }
-        .metric-card { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 16px; padding: 20px; margin: 10px 0; }
-        .metric-value { font-size: 2.8rem; font-weight: 900; color: white; }
-        .metric-label { color: rgba(255,255,255,0.8); font-size: 0.8rem; }
-        .warning-banner { background: rgba(245,158,11,0.1); border: 1px solid #f59e0b;
-            border-radius: 12px; padding: 15px; margin: 15px 0; color: #f59e0b; }
-        </style>
-    """, unsafe_allow_html=True)
+    # Emitted on every rerun: Streamlit removes elements a rerun doesn't write
+    st.markdown(load_css(), unsafe_allow_html=True)
+
+_SCORE_CARD_HTML = """
+    <div class="investor-header">
+        <h2>📊 Risk-Adjusted Score: {score}/100</h2>
+        <p style="color: {color}; font-size: 1.2rem;">
+            Data Confidence: {confidence}% {badge}
+        </p>
+        <p>Target: <strong>{target}</strong></p>
+    </div>
+"""
 
 def render_score_card(result: OpportunityResult):
     confidence_color = "#10b981" if result.confidence >= 80 else "#f59e0b"
-    st.markdown(f"""
-        <div class="investor-header">
-            <h2>📊 Risk-Adjusted Score: {result.risk_adjusted_score}/100</h2>
-            <p style="color: {confidence_color}; font-size: 1.2rem;">
-                Data Confidence: {result.confidence}% {'✅ Verified' if result.confidence >= 80 else '⚠️ Estimated'}
-            </p>
-            <p>Target: <strong>{result.target}</strong></p>
-        </div>
-    """, unsafe_allow_html=True)
+    confidence_badge = "✅ Verified" if result.confidence >= 80 else "⚠️ Estimated"
+    st.markdown(_SCORE_CARD_HTML.format(
+        score=result.risk_adjusted_score, color=confidence_color,
+        confidence=result.confidence, badge=confidence_badge, target=result.target
+    ), unsafe_allow_html=True)
     
     if result.market.is_estimated:
         st.warning("⚠️ AI-estimated data - verify before decision-making.")
 
+_METRIC_CARD_TMPL = (
+    '<div class="metric-card">'
+    '<div class="metric-value">{score}</div><div class="metric-label">{label}</div>'
+    '</div>'
+).format
+
+def build_metric_grid_html(scores: tuple) -> str:
+    cards = "".join(_METRIC_CARD_TMPL(score=score, label=label) for label, score in scores)
+    return f'<div class="metric-grid">{cards}</div>'
+
 def render_metrics_grid(result: OpportunityResult):
-    cols = st.columns(4)
-    scores = [("🌍 Market", result.market.confidence), ("⚙️ Technical", 85), 
-              ("💰 Revenue", int(result.financial["base"].conversion * 10)), ("🎯 Strategy", result.strategic.fit_score * 10)]
-    for col, (label, score) in zip(cols, scores):
-        with col:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">{score}</div><div class="metric-label">{label}</div>
-                </div>
-            """, unsafe_allow_html=True)
+    scores = (("🌍 Market", result.market.confidence), ("⚙️ Technical", 85), 
+              ("💰 Revenue", int(result.financial["base"].conversion * 10)), ("🎯 Strategy", result.strategic.fit_score * 10))
+    st.markdown(build_metric_grid_html(scores), unsafe_allow_html=True)
+
+_CASE_COLORS = MappingProxyType({"base": "violet", "bull": "green", "bear": "red"})
 
 def render_financial_section(result: OpportunityResult):
     st.markdown("### 📊 Financial Model (3 Cases)")
-    case_colors = {"base": "#667eea", "bull": "#10b981", "bear": "#ef4444"}
     for case, model in result.financial.items():
-        st.markdown(f"""
-            <div style="border-left: 4px solid {case_colors[case]}; padding: 15px; margin: 10px 0; background: rgba(30,41,59,0.5);">
-                <strong>{case.title()} Case:</strong><br>
-                Conversion: {model.conversion}% | ARR: {model.arr} | Payback: {model.payback_days} days | LTV: {model.ltv}
-            </div>
-        """, unsafe_allow_html=True)
+        summary = f"Conversion: {model.conversion}% | ARR: {model.arr} | Payback: {model.payback_days} days | LTV: {model.ltv}"
+        with st.container(border=True):
+            # Escape "$" so Streamlit markdown doesn't read the amounts as LaTeX
+            st.markdown(f"**:{_CASE_COLORS[case]}[{case.title()} Case]**  \n" + summary.replace("$", "\\$"))
 
 def render_strategic_section(result: OpportunityResult):
     st.markdown("### 🎯 Strategic Positioning")
+    strategic = result.strategic
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Fit Score", f"{result.strategic.fit_score}/10", 
-                 delta="Core" if result.strategic.fit_score >= 9 else "Adjacent")
-        st.metric("Velocity", f"{result.strategic.velocity}/10")
+        st.metric("Fit Score", f"{strategic.fit_score}/10", 
+                 delta="Core" if strategic.fit_score >= 9 else "Adjacent")
+        st.metric("Velocity", f"{strategic.velocity}/10")
     with col2:
-        st.metric("Risk Level", result.strategic.risk_level)
-        st.metric("Moat Benefit", result.strategic.moat_benefit[:20] + "...")
+        st.metric("Risk Level", strategic.risk_level)
+        st.metric("Moat Benefit", strategic.moat_benefit[:20] + "...")
 
 def render_dev_impact(result: OpportunityResult):
     st.markdown("### 👨‍💻 Development Impact")
-    st.progress(result.technical.team_pct_of_sprint / 100, 
-               text=f"🔄 Sprint Capacity Used: {result.technical.team_pct_of_sprint}%")
+    tech = result.technical
+    st.progress(tech.team_pct_of_sprint / 100, 
+               text=f"🔄 Sprint Capacity Used: {tech.team_pct_of_sprint}%")
     
     impact_data = {
-        "Engineering Hours": f"{result.technical.hours}h",
-        "Timeline": f"{result.technical.timeline_days} days",
-        "Cost": result.technical.cost_at_120_hr,
-        "Parallelizable": "✅ Yes" if result.technical.parallelizable else "❌ No",
-        "Runway Impact": result.dev_impact["runway_impact"]
+        "Engineering Hours": f"{tech.hours}h",
+        "Timeline": f"{tech.timeline_days} days",
+        "Cost": tech.cost_at_120_hr,
+        "Parallelizable": "✅ Yes" if tech.parallelizable else "❌ No",
+        "Runway Impact": result.dev_impact.runway_impact
     }
     
     for label, value in impact_data.items():
         st.metric(label, value)
 
+@st.fragment
+def render_history_panel():
+    if st.button("📜 View History"):
+        history = asyncio.run(db.get_history())
+        if history:
+            for item in history:
+                st.caption(f"• {item['target'][:30]}... | {item['risk_adjusted_score']}/100")
+        else:
+            st.info("No history yet")
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def export_analysis_json(analysis_key: str, _result: OpportunityResult) -> str:
+    return _result.model_dump_json(indent=2)
+
+@st.fragment
 def render_download_section(result: OpportunityResult):
-    st.download_button("📥 Export JSON", result.json(), 
+    export = export_analysis_json(f"{result.target}{result.analysis_date}", result)
+    st.download_button("📥 Export JSON", export, 
                       f"{result.target.replace(' ', '_')}.json", "application/json")
 
 # ============================================================================
 # 🚀 MAIN APP
 # ============================================================================
+_SESSION_DEFAULTS = (
+    ("analysis_complete", False),
+    ("result", None),
+    ("analysis_count", 0),
+    ("last_analysis_time", None),
+)
+
 def main():
-    # Initialize database
-    asyncio.run(db.init_db())
+    for key, value in _SESSION_DEFAULTS:
+        st.session_state.setdefault(key, value)
     
     render_header()
     
@@ -513,47 +686,57 @@ def main():
     with st.sidebar:
         st.title("⚙️ Settings")
         st.metric("Rate Limit", "10 analyses/hour")
-        if st.button("📜 View History"):
-            history = asyncio.run(db.get_history())
-            if history:
-                for item in history:
-                    st.caption(f"• {item['target'][:30]}... | {item['risk_adjusted_score']}/100")
-            else:
-                st.info("No history yet")
+        force_refresh = st.checkbox("🔄 Force refresh", help="Ignore saved analyses and cached AI estimates for this run")
+        render_history_panel()
     
     # Main UI
     st.title("🧠 Trophi.ai Scale Decision Engine")
     st.caption("**Investor-Grade Assessment** | A16Z SPEEDRUN Portfolio")
     
-    col_input, col_btn = st.columns([3, 1])
-    with col_input:
-        target_name = st.text_input("🎯 Opportunity", 
-                                   placeholder="e.g., 'iRacing F1 25 Integration'")
-    with col_btn:
-        analyze_btn = st.button("⚡ Execute Analysis", type="primary", use_container_width=True)
+    with st.form("analysis_form", border=False):
+        col_input, col_btn = st.columns([3, 1])
+        with col_input:
+            target_name = st.text_input("🎯 Opportunity", 
+                                       placeholder="e.g., 'iRacing F1 25 Integration'")
+        with col_btn:
+            analyze_btn = st.form_submit_button("⚡ Execute Analysis", type="primary", use_container_width=True)
     
+    target_name = normalize_target(target_name)
     if analyze_btn and target_name:
-        if st.session_state.get('analysis_count', 0) >= 10:
-            time_since = (datetime.now() - st.session_state.last_analysis_time).seconds
-            if time_since < 3600:
-                st.error(f"⏰ Rate limited. Wait {3600 - time_since}s")
-                return
+        current = st.session_state.result
+        if force_refresh:
+            saved = None
+        elif current and current.target == target_name:
+            saved = current
+        else:
+            saved = asyncio.run(db.get_recent_analysis(target_name))
+        # Never pin a result built while every data source was down
+        if saved and saved.market.source != FALLBACK_MARKET["source"]:
+            st.session_state.result = saved
+            st.session_state.analysis_complete = True
+            st.toast("💾 Loaded saved analysis - tick Force refresh to rerun", icon="♻️")
+        else:
+            if st.session_state.analysis_count >= 10:
+                time_since = (datetime.now() - st.session_state.last_analysis_time).seconds
+                if time_since < 3600:
+                    st.error(f"⏰ Rate limited. Wait {3600 - time_since}s")
+                    return
         
-        progress_bar = st.progress(0, text="Initializing pipeline...")
+            progress_bar = st.progress(0, text="Initializing pipeline...")
         
-        try:
-            result = asyncio.run(pipeline.run_full_pipeline(target_name, progress_bar))
-            st.session_state.result = result
-            st.session_state.analysis_complete = True
-            st.session_state.analysis_count = st.session_state.get('analysis_count', 0) + 1
-            st.session_state.last_analysis_time = datetime.now()
-            progress_bar.empty()
-        except Exception as e:
-            logger.error("Analysis failed", error=str(e))
-            st.error(f"❌ Failed: {str(e)}")
-            return
+            try:
+                result = asyncio.run(pipeline.run_full_pipeline(target_name, progress_bar, force_refresh))
+                st.session_state.result = result
+                st.session_state.analysis_complete = True
+                st.session_state.analysis_count += 1
+                st.session_state.last_analysis_time = datetime.now()
+                progress_bar.empty()
+            except Exception as e:
+                logger.error("Analysis failed", error=str(e))
+                st.error(f"❌ Failed: {str(e)}")
+                return
     
-    if st.session_state.get('analysis_complete') and st.session_state.get('result'):
+    if st.session_state.analysis_complete and st.session_state.result:
         result = st.session_state.result
         render_score_card(result)
         render_metrics_grid(result)